@@ -1,57 +1,154 @@
 import streamlit as st
-import arxiv
+import math
 import os
+import re
+import shutil
+import tempfile
 from pathlib import Path
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import xml.etree.ElementTree as ET
+from functools import cache, lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+STORAGE_DIR = Path("papers_storage")
+PAGE_SIZE = 20
+
+CATEGORY_LABELS = {
+    "red_teaming": "Red Teaming",
+    "blue_teaming": "Blue Teaming",
+}
+
+@st.cache_resource
+def load_css():
+    """Read the app stylesheet once per process"""
+    return Path(__file__).with_name("styles.css").read_text()
+
+@cache
 def setup_directories():
-    """Create directories for storing papers"""
-    Path("papers_storage/red_teaming").mkdir(parents=True, exist_ok=True)
-    Path("papers_storage/blue_teaming").mkdir(parents=True, exist_ok=True)
+    """Create directories for storing papers, once per process"""
+    for category in CATEGORY_LABELS:
+        (STORAGE_DIR / category).mkdir(parents=True, exist_ok=True)
 
-def extract_arxiv_id(url):
-    """Extract arXiv ID from URL"""
-    url = url.strip()
+# New-style (2202.12467) or old-style (hep-th/9901001) ID; any vN suffix is left out.
+# Old-style IDs are captured as archive, optional subject class and number so the
+# class can be dropped: arXiv's canonical form of math.GT/0309136 is math/0309136.
+_ARXIV_ID_RE = re.compile(
+    r'(?<![\d.])(\d{4}\.\d{4,5})(?!\d)'
+    r'|(?<![a-z\-])([a-z][a-z\-]*)(\.[A-Z]{2})?/(\d{7})(?!\d)'
+)
+
+class CappedRetry(Retry):
+    """Retry policy that caps server-requested Retry-After sleeps"""
     
-    if 'arxiv.org/abs/' in url:
-        id_part = url.split('arxiv.org/abs/')[-1]
-    elif 'arxiv.org/pdf/' in url:
-        id_part = url.split('arxiv.org/pdf/')[-1].replace('.pdf', '')
-    else:
-        id_part = url
+    MAX_RETRY_AFTER = 30
     
-    id_part = id_part.split('v')[0]
-    id_part = id_part.strip('/')
-    id_part = id_part.split('#')[0]
-    id_part = id_part.split('?')[0]
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER)
+
+@st.cache_resource
+def get_session():
+    """Shared HTTP session so arXiv connections are kept alive across downloads"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        # Back off on arXiv's rate-limit/overload responses, honouring a capped Retry-After
+        max_retries=CappedRetry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@lru_cache(maxsize=256)
+def extract_arxiv_id(url):
+    """Extract the canonical arXiv ID from a URL or ID"""
+    match = _ARXIV_ID_RE.search(url.strip())
+    if not match:
+        return ''
+    new_style, archive, _subject_class, number = match.groups()
+    return new_style or f"{archive}/{number}"
+
+def get_papers_metadata(arxiv_ids):
+    """Fetch metadata for several arXiv IDs in one API query, keyed by ID"""
+    arxiv_ids = list(arxiv_ids)
+    response = get_session().get(
+        ARXIV_API_URL,
+        params={'id_list': ','.join(arxiv_ids), 'max_results': len(arxiv_ids)},
+        timeout=(5, 30)
+    )
+    response.raise_for_status()
     
-    return id_part.strip()
+    papers = {}
+    for entry in ET.fromstring(response.content).iter(f"{_ATOM}entry"):
+        entry_id = entry.findtext(f"{_ATOM}id")
+        title = entry.findtext(f"{_ATOM}title")
+        published = entry.findtext(f"{_ATOM}published")
+        # Skip partial and error entries (e.g. for malformed IDs) instead of failing the batch
+        if not (entry_id and title and published) or 'arxiv.org/abs/' not in entry_id:
+            continue
+        arxiv_id = extract_arxiv_id(entry_id)
+        if not arxiv_id:
+            continue
+        pdf_url = next(
+            (link.get('href') for link in entry.iter(f"{_ATOM}link") if link.get('title') == 'pdf'),
+            f"https://arxiv.org/pdf/{arxiv_id}"
+        )
+        papers[arxiv_id] = {
+            'title': ' '.join(title.split()),
+            'authors': ', '.join(name.text for name in entry.iter(f"{_ATOM}name")),
+            'abstract': entry.findtext(f"{_ATOM}summary", '').strip(),
+            'year': int(published[:4]),
+            'pdf_url': pdf_url,
+            'arxiv_id': arxiv_id,
+            'categories': [category.get('term') for category in entry.iter(f"{_ATOM}category")]
+        }
+    return papers
+
+def file_stem(arxiv_id):
+    """File name stem for a paper; old-style IDs like hep-th/9901001 contain a slash"""
+    return arxiv_id.replace('/', '_')
+
+@st.cache_data(ttl=3600, show_spinner="Fetching arXiv metadata...")
+def fetch_paper_metadata(arxiv_id):
+    """Fetch paper metadata from arXiv, cached by arXiv ID"""
+    papers = get_papers_metadata([arxiv_id])
+    if arxiv_id not in papers:
+        raise ValueError("No paper found with this ID")
+    return papers[arxiv_id]
 
 def get_paper_metadata(_url):
-    """Get paper metadata from """
+    """Get paper metadata from an arXiv URL or ID"""
     try:
         arxiv_id = extract_arxiv_id(_url)
         
         if not arxiv_id:
             raise ValueError("Could not extract valid arXiv ID")
         
-        search = arxiv.Search(id_list=[arxiv_id])
-        results = list(search.results())
-        if not results:
-            raise ValueError("No paper found with this ID")
-        paper = results[0]
+        stored = find_stored_metadata(arxiv_id)
+        if stored is not None:
+            return stored
         
-        return {
-            'title': paper.title,
-            'authors': ', '.join(author.name for author in paper.authors),
-            'abstract': paper.summary,
-            'year': paper.published.year,
-            'pdf_url': paper.pdf_url,
-            'arxiv_id': arxiv_id,
-            'categories': paper.categories
-        }
+        return fetch_paper_metadata(arxiv_id)
     except Exception as e:
         st.error(f"Error fetching paper metadata: {str(e)}")
         return None
@@ -59,36 +156,140 @@ def get_paper_metadata(_url):
 def download_pdf(pdf_url, category, arxiv_id):
     """Download PDF from arXiv"""
     try:
-        response = requests.get(pdf_url)
-        response.raise_for_status()
+        filename = f"{file_stem(arxiv_id)}.pdf"
+        save_path = STORAGE_DIR / category / filename
         
-        filename = f"{arxiv_id}.pdf"
-        save_path = f"papers_storage/{category}/{filename}"
+        if save_path.exists():
+            return filename
         
-        with open(save_path, "wb") as f:
-            f.write(response.content)
+        # Unique temp name so concurrent sessions adding the same paper don't collide
+        fd, tmp_name = tempfile.mkstemp(dir=save_path.parent, prefix=f"{filename}.", suffix=".tmp")
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with get_session().get(pdf_url, timeout=(5, 60), stream=True) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, f, length=64 * 1024)
+            os.replace(tmp_path, save_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
         
         return filename
     except Exception as e:
         st.error(f"Error downloading PDF: {str(e)}")
         return None
 
+def loads_json(data):
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_json(obj):
+    """Serialize to indented JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def save_metadata(metadata, category):
+    """Write paper metadata atomically so a partial file is never listed"""
+    metadata_path = STORAGE_DIR / category / f"{file_stem(metadata['arxiv_id'])}_metadata.json"
+    
+    fd, tmp_name = tempfile.mkstemp(dir=metadata_path.parent, prefix=f"{metadata_path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps_json(metadata))
+        os.replace(tmp_path, metadata_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def load_metadata(path):
+    """Load a single paper metadata file"""
+    with open(path, 'rb') as f:
+        return loads_json(f.read())
+
+def find_stored_metadata(arxiv_id):
+    """Return metadata for a paper already in the collection, if any"""
+    for category in CATEGORY_LABELS:
+        metadata_path = STORAGE_DIR / category / f"{file_stem(arxiv_id)}_metadata.json"
+        if metadata_path.exists():
+            return loads_json(metadata_path.read_bytes())
+    return None
+
+# Keep only the current snapshot per category; older mtime keys are never hit again
+@st.cache_data(show_spinner=False, max_entries=len(CATEGORY_LABELS) * 2)
+def load_collection(papers_path, dir_mtime_ns):
+    """Load all paper metadata in a directory, cached until the directory changes"""
+    with os.scandir(papers_path) as it:
+        entries = {entry.name: entry for entry in it if entry.is_file()}
+    metadata_paths = [
+        entry.path for name, entry in entries.items()
+        if name.endswith('_metadata.json')
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        papers = list(executor.map(load_metadata, metadata_paths))
+    for paper in papers:
+        paper['has_pdf'] = f"{file_stem(paper['arxiv_id'])}.pdf" in entries
+    
+    return sorted(papers, key=lambda x: x['year'], reverse=True)
+
 def list_papers(category):
     """List all papers in a category"""
-    papers_path = f"papers_storage/{category}"
-    papers = []
+    papers_path = STORAGE_DIR / category
     
-    if os.path.exists(papers_path):
-        for file in os.listdir(papers_path):
-            if file.endswith('_metadata.json'):
-                with open(os.path.join(papers_path, file)) as f:
-                    metadata = json.load(f)
-                    papers.append(metadata)
+    if not papers_path.exists():
+        return []
     
-    return sorted(papers, key=lambda x: x['year'], reverse=True)
+    return load_collection(papers_path, papers_path.stat().st_mtime_ns)
+
+def paginate(papers, category):
+    """Return the slice of papers for the page picked in the category's pager"""
+    page_count = math.ceil(len(papers) / PAGE_SIZE)
+    page = 1
+    if page_count > 1:
+        page = st.number_input("Page", 1, page_count, key=f"{category}_page")
+    return papers[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+
+def render_collection(category, emoji):
+    """Render the header and paper cards for one category"""
+    label = CATEGORY_LABELS[category]
+    st.markdown(
+        f"<div class='category-header {category}'><h2>{emoji} {label} Papers</h2></div>",
+        unsafe_allow_html=True
+    )
+    
+    papers = list_papers(category)
+    if not papers:
+        st.info(f"🔍 No papers in {label} collection yet.")
+        return
+    
+    with st.container(key=f"{category}_papers"):
+        for paper in paginate(papers, category):
+            with st.expander(f"📑 {paper['title']}"):
+                st.write("👥 **Authors:**", paper['authors'])
+                st.write("📅 **Year:**", paper['year'])
+                st.write("📝 **Abstract:**")
+                st.write(paper['abstract'])
+                st.markdown("---")
+                
+                pdf_name = f"{file_stem(paper['arxiv_id'])}.pdf"
+                if paper['has_pdf']:
+                    # Pass the reader itself so the bytes are only read on click
+                    st.download_button(
+                        "📥 Download PDF",
+                        (STORAGE_DIR / category / pdf_name).read_bytes,
+                        file_name=pdf_name,
+                        mime="application/pdf",
+                        key=f"{category}_{paper['arxiv_id']}"
+                    )
+                
+                st.markdown(f"[🔗 View on arXiv](https://arxiv.org/abs/{paper['arxiv_id']})")
 
 st.set_page_config(page_title="Red/Blue Teaming Paper Collection", layout="wide")
 setup_directories()
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 st.title("Red/Blue Teaming Paper Collection")
 
@@ -102,81 +303,11 @@ with collection_tab:
     # Create two columns for the categories
     left_col, right_col = st.columns(2)
     
-    # Red Teaming Papers
     with left_col:
-        st.markdown("""
-        <div style='background-color: rgba(255, 99, 71, 0.1); padding: 1rem; border-radius: 0.5rem; border-left: 4px solid #ff6347;'>
-            <h2 style='color: #ff6347; margin: 0;'>🔥 Red Teaming Papers</h2>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        red_papers = list_papers("red_teaming")
-        if not red_papers:
-            st.info("🔍 No papers in Red Teaming collection yet.")
-        else:
-            for paper in red_papers:
-                with st.expander(f"📑 {paper['title']}"):
-                    st.markdown("""
-                    <div style='background-color: rgba(255, 99, 71, 0.05); padding: 1rem; border-radius: 0.5rem;'>
-                    """, unsafe_allow_html=True)
-                    
-                    st.write("👥 **Authors:**", paper['authors'])
-                    st.write("📅 **Year:**", paper['year'])
-                    st.write("📝 **Abstract:**")
-                    st.write(paper['abstract'])
-                    st.markdown("---")
-                    
-                    pdf_path = f"papers_storage/red_teaming/{paper['arxiv_id']}.pdf"
-                    if os.path.exists(pdf_path):
-                        with open(pdf_path, 'rb') as pdf_file:
-                            st.download_button(
-                                "📥 Download PDF",
-                                pdf_file,
-                                file_name=f"{paper['arxiv_id']}.pdf",
-                                mime="application/pdf",
-                                key=f"red_{paper['arxiv_id']}"
-                            )
-                    
-                    st.markdown(f"[🔗 View on arXiv](https://arxiv.org/abs/{paper['arxiv_id']})")
-                    st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Blue Teaming Papers
+        render_collection("red_teaming", "🔥")
+    
     with right_col:
-        st.markdown("""
-        <div style='background-color: rgba(0, 122, 255, 0.1); padding: 1rem; border-radius: 0.5rem; border-left: 4px solid #007AFF;'>
-            <h2 style='color: #007AFF; margin: 0;'>🛡️ Blue Teaming Papers</h2>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        blue_papers = list_papers("blue_teaming")
-        if not blue_papers:
-            st.info("🔍 No papers in Blue Teaming collection yet.")
-        else:
-            for paper in blue_papers:
-                with st.expander(f"📑 {paper['title']}"):
-                    st.markdown("""
-                    <div style='background-color: rgba(0, 122, 255, 0.05); padding: 1rem; border-radius: 0.5rem;'>
-                    """, unsafe_allow_html=True)
-                    
-                    st.write("👥 **Authors:**", paper['authors'])
-                    st.write("📅 **Year:**", paper['year'])
-                    st.write("📝 **Abstract:**")
-                    st.write(paper['abstract'])
-                    st.markdown("---")
-                    
-                    pdf_path = f"papers_storage/blue_teaming/{paper['arxiv_id']}.pdf"
-                    if os.path.exists(pdf_path):
-                        with open(pdf_path, 'rb') as pdf_file:
-                            st.download_button(
-                                "📥 Download PDF",
-                                pdf_file,
-                                file_name=f"{paper['arxiv_id']}.pdf",
-                                mime="application/pdf",
-                                key=f"blue_{paper['arxiv_id']}"
-                            )
-                    
-                    st.markdown(f"[🔗 View on arXiv](https://arxiv.org/abs/{paper['arxiv_id']})")
-                    st.markdown("</div>", unsafe_allow_html=True)
+        render_collection("blue_teaming", "🛡️")
 
 # Add Papers Tab (Second)
 with add_tab:
@@ -188,8 +319,8 @@ with add_tab:
     
     category = st.selectbox(
         "Select Category",
-        ["red_teaming", "blue_teaming"],
-        format_func=lambda x: "Red Teaming" if x == "red_teaming" else "Blue Teaming"
+        list(CATEGORY_LABELS),
+        format_func=CATEGORY_LABELS.__getitem__
     )
     
     arxiv_url = st.text_input("Enter arXiv URL or ID")
@@ -211,10 +342,8 @@ with add_tab:
                 with st.spinner("Downloading PDF..."):
                     filename = download_pdf(metadata['pdf_url'], category, metadata['arxiv_id'])
                     if filename:
-                        metadata_path = f"papers_storage/{category}/{metadata['arxiv_id']}_metadata.json"
-                        with open(metadata_path, 'w') as f:
-                            json.dump(metadata, f, indent=2)
-                        st.success(f"Paper added to {category.replace('_', ' ')} collection!")
+                        save_metadata(metadata, category)
+                        st.success(f"Paper added to {CATEGORY_LABELS[category]} collection!")
                         st.rerun()
 
 st.markdown("""